@@ -1,12 +1,22 @@
 import os
 import json
-from datetime import datetime, timedelta, timezone
+import logging
+import hashlib
+import functools
+import threading
+import importlib.util
+from bisect import insort
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from cachetools import TTLCache
+from datetime import datetime, time, timedelta, timezone
 from openai import OpenAI
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 
 # Import your scheduler functions
-from find_free_time import find_common_free_slots
+from find_free_time import OFF_HOURS, build_busy_periods, get_all_working_hours, get_common_working_hours, iter_common_free_slots
 # Import configuration
 from config import (
     VLLM_BASE_URL, 
@@ -14,12 +24,213 @@ from config import (
     KEYS_DIRECTORY,
     DEFAULT_MEETING_DURATION,
     CALENDAR_LOOKUP_DAYS,
+    LLM_CACHE_SIZE,
+    LLM_CACHE_TTL,
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL,
     WORKING_HOURS_START,
     WORKING_HOURS_END,
     IST_OFFSET_HOURS,
     IST_OFFSET_MINUTES
 )
 
+# orjson is an optional, faster drop-in for parsing and dumping JSON
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+def json_loads(data):
+    """Parse JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_default(value):
+    """Encode values JSON has no type for, datetimes as ISO 8601 like orjson does"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+def json_dumps_indented(obj):
+    """Serialize an object to indented JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, default=_json_default)
+
+def content_hash(obj):
+    """Hash JSON-like data, datetimes included, independently of its key order"""
+    if orjson is not None:
+        normalized = orjson.dumps(obj, default=_json_default, option=orjson.OPT_SORT_KEYS)
+    else:
+        normalized = json.dumps(obj, sort_keys=True, separators=(',', ':'), default=_json_default).encode()
+    return hashlib.blake2b(normalized).digest()
+
+# OAuth credentials per token file, shared by all threads
+_creds_cache = {}
+_creds_lock = threading.Lock()
+# Calendar services per thread and token file; a service owns an httplib2 transport,
+# which is not thread-safe, so concurrent requests must not share one
+_thread_services = threading.local()
+
+def _get_creds(token_path):
+    """Load (once per token file) the OAuth credentials of a user"""
+    with _creds_lock:
+        creds = _creds_cache.get(token_path)
+    if creds is None:
+        creds = Credentials.from_authorized_user_file(token_path)
+        with _creds_lock:
+            creds = _creds_cache.setdefault(token_path, creds)
+    return creds
+
+def _invalidate_creds(token_path):
+    """Forget the cached credentials of one token file so they are reloaded from disk"""
+    with _creds_lock:
+        _creds_cache.pop(token_path, None)
+
+def _get_service(token_path):
+    """Build (once per thread and token file) the Google Calendar service of a user"""
+    creds = _get_creds(token_path)
+    services = getattr(_thread_services, "services", None)
+    if services is None:
+        services = _thread_services.services = {}
+    cached = services.get(token_path)
+    # Rebuild the service when its credentials have been reloaded since
+    if cached is None or cached[0] is not creds:
+        # Use the discovery document bundled with google-api-python-client instead of
+        # fetching it over the network, and skip the file-based discovery cache
+        service = build("calendar", "v3", credentials=creds, cache_discovery=False, static_discovery=True)
+        cached = services[token_path] = (creds, service)
+    return cached[1]
+
+IST = timezone(timedelta(hours=IST_OFFSET_HOURS, minutes=IST_OFFSET_MINUTES))
+WORK_END_TIME = time(WORKING_HOURS_END)
+# Length of the daily off-hours block, from the end of one working day to the start of the next
+OFF_HOURS_DURATION = timedelta(hours=24 - WORKING_HOURS_END + WORKING_HOURS_START)
+
+# Static LLM instructions. They are sent as byte-identical system messages on every
+# request so vLLM's automatic prefix caching can reuse their KV cache.
+# The parse prompt only names the fields, their types are enforced by
+# PARSE_JSON_SCHEMA through guided decoding.
+PARSE_SYSTEM_PROMPT = (
+    "Extract the meeting request as JSON: duration_minutes (default "
+    f"{DEFAULT_MEETING_DURATION}), time_preference (day named, e.g. 'Thursday', "
+    "'next week'), meeting_type (from subject/content), urgency (high/medium/low by tone)."
+)
+
+HELPER_SYSTEM_PROMPT = """You are a helpful EXPERT SCHEDULING ASSISTANT that provides clear, actionable insights about meeting scheduling decisions. Analyze the meeting scheduling decision given by the user and provide helpful insights.
+
+Please provide:
+1. Why this time slot is optimal for all attendees
+2. Key benefits of this scheduling decision
+3. Any considerations the organizer should keep in mind
+4. Productivity tips for making the meeting effective
+
+Format your response as a helpful, concise JSON with these keys:
+- "reasoning": Brief explanation of why this time works well
+- "benefits": List of 2-3 key benefits
+- "considerations": List of 1-2 things to keep in mind
+- "confidence_score": Your confidence in this scheduling (high/medium/low)"""
+
+# Schema of the parse_meeting_request answer, enforced with vLLM guided decoding
+PARSE_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "duration_minutes": {"type": "integer"},
+        "time_preference": {"type": "string"},
+        "meeting_type": {"type": "string"},
+        "urgency": {"type": "string", "enum": ["high", "medium", "low"]}
+    },
+    "required": ["duration_minutes", "time_preference", "meeting_type", "urgency"]
+}
+
+# Decode budgets for the two LLM calls; their JSON answers are much shorter
+PARSE_MAX_TOKENS = 128
+HELPER_MAX_TOKENS = 512
+
+# Insights used when the model does not return valid JSON (reasoning is filled in per meeting)
+HELPER_FALLBACK_INSIGHTS = {
+    "reasoning": "",
+    "benefits": (
+        "All attendees are available at this time",
+        "No conflicts with existing meetings",
+        "Optimal time slot for productivity"
+    ),
+    "confidence_score": "high"
+}
+
+# Insight fields filled in per request, never reused for another meeting
+PER_REQUEST_INSIGHTS = ("scheduled_datetime", "attendee_count")
+
+def _slot_reasoning(start_time):
+    """Generic reasoning sentence naming the meeting slot"""
+    return (f"Scheduled for {start_time.strftime('%A, %B %d, %Y')} at {start_time.strftime('%I:%M %p')} "
+            "to accommodate all attendees' availability.")
+
+def _mentions_date(insights, start_time):
+    """Whether any reusable insight names the meeting's calendar date"""
+    date_terms = (
+        start_time.strftime('%B %d').lower(),
+        f"{start_time.strftime('%B').lower()} {start_time.day}",
+        f"{start_time.day} {start_time.strftime('%B').lower()}",
+        start_time.date().isoformat(),
+    )
+    return any(
+        term in str(value).lower()
+        for key, value in insights.items() if key not in PER_REQUEST_INSIGHTS
+        for term in date_terms
+    )
+
+# Day names as they may appear in a time preference, mapped to weekday bits
+# (bit i is set for date.weekday() == i) so a set of days is a single int mask
+WEEKDAY_BITS = {
+    "monday": 1 << 0,
+    "tuesday": 1 << 1,
+    "wednesday": 1 << 2,
+    "thursday": 1 << 3,
+    "friday": 1 << 4,
+    "saturday": 1 << 5,
+    "sunday": 1 << 6
+}
+WORKING_WEEKDAYS_MASK = 0b0011111  # Monday ... Friday
+# How a found slot is described, by date priority (preferred day, other weekday, weekend)
+SLOT_KINDS = ("slot", "alternative slot", "weekend slot")
+
+@functools.lru_cache(maxsize=64)
+def _off_hours_for_range(start_date, end_date):
+    """Build (once per date range) the default daily off-hours events between two dates"""
+    first_off_start = datetime.combine(start_date, WORK_END_TIME, tzinfo=IST)
+    off_periods = [
+        (off_start, off_start + OFF_HOURS_DURATION)
+        for off_start in (first_off_start + timedelta(days=i) for i in range((end_date - start_date).days + 1))
+    ]
+    return tuple({
+        "StartTime": off_start.isoformat(),
+        "EndTime": off_end.isoformat(),
+        "NumAttendees": 1,
+        "Attendees": ["SELF"],
+        "Summary": OFF_HOURS,
+        "_start_dt": off_start,
+        "_end_dt": off_end,
+        "_start_date": off_start.date(),
+        "_start_ts": off_start.timestamp()
+    } for off_start, off_end in off_periods)
+
+# Connection pool to the vLLM server and background worker threads shared by requests
+LLM_MAX_CONNECTIONS = 32
+LLM_MAX_KEEPALIVE = 16
+AGENT_WORKERS = 16
+# Multiplex LLM calls over one connection with HTTP/2 when h2 (httpx[http2]) is installed,
+# httpx only negotiates it for https:// servers and keeps HTTP/1.1 otherwise
+LLM_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Maximum number of calls the Google Calendar API accepts in one batch request
+CALENDAR_BATCH_LIMIT = 50
+# Maximum page size of events.list (the default page is only 250 events)
+CALENDAR_MAX_RESULTS = 2500
+
 class AISchedulingAgent:
     def __init__(self, base_url=None, model_path=None, keys_directory=None):
         """
@@ -33,73 +244,269 @@ class AISchedulingAgent:
         self.base_url = base_url or VLLM_BASE_URL
         self.model_path = model_path or MODEL_PATH
         self.keys_directory = keys_directory or KEYS_DIRECTORY
-        self.client = OpenAI(api_key="NULL", base_url=self.base_url, timeout=None, max_retries=0)
+        # Keep connections to the vLLM server alive between calls instead of reconnecting
+        self.client = OpenAI(
+            api_key="NULL",
+            base_url=self.base_url,
+            timeout=None,
+            max_retries=0,
+            http_client=httpx.Client(
+                http2=LLM_HTTP2,
+                timeout=None,
+                limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_KEEPALIVE)
+            )
+        )
+        # Worker threads shared by all requests for running LLM calls in the background
+        self._executor = ThreadPoolExecutor(max_workers=AGENT_WORKERS)
+        # Parsed LLM responses keyed by a hash of the model and prompts
+        self._llm_cache = TTLCache(maxsize=LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL)
+        # Meeting insights ("plan templates") keyed by everything the user_helper prompt
+        # depends on except the calendar date, so a weekly repeat of the same meeting
+        # reuses them. Unlike _llm_cache, which only caches deterministic (temperature 0)
+        # calls, this cache deliberately replays one sampled user_helper answer; answers
+        # that name their date are not stored
+        self._plan_cache = TTLCache(maxsize=LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL)
+        # Final responses keyed by the request and the calendars it was answered from,
+        # so a retried request is answered again only if no attendee's calendar changed
+        self._response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+        self._cache_lock = threading.Lock()
         
     def parse_datetime(self, datetime_str):
         """Parse ISO datetime string to datetime object"""
         return datetime.fromisoformat(datetime_str)
     
+    def _token_path(self, user):
+        """Path of the OAuth token file for a user"""
+        return f"{self.keys_directory}/{user.split('@')[0]}.token"
+    
+    def _build_calendar_service(self, user):
+        """Get an authorized Google Calendar service for a user, reusing cached ones"""
+        token_path = self._token_path(user)
+        user_creds = _get_creds(token_path)
+        if user_creds.expired and not user_creds.refresh_token:
+            # The cached token can no longer be refreshed in memory, reload this
+            # user's token from disk (services built on it are rebuilt as well)
+            _invalidate_creds(token_path)
+        return _get_service(token_path)
+    
+    def _list_events_request(self, calendar_service, start, end):
+        """Create (but do not execute) the events.list request for a user's primary calendar"""
+        return calendar_service.events().list(
+            calendarId='primary', 
+            timeMin=start,
+            timeMax=end,
+            singleEvents=True,
+            orderBy='startTime',
+            # Largest page the API allows, so one batched call covers the whole window
+            maxResults=CALENDAR_MAX_RESULTS
+        )
+    
+    def _add_parsed_times(self, event):
+        """Attach the parsed start/end datetimes to an event so they are parsed only once"""
+        event["_start_dt"] = self.parse_datetime(event["StartTime"])
+        event["_end_dt"] = self.parse_datetime(event["EndTime"])
+        event["_start_date"] = event["_start_dt"].date()
+        event["_start_ts"] = event["_start_dt"].timestamp()
+        return event
+    
+    def _format_events(self, events):
+        """Convert Google Calendar API event items to the hackathon event format"""
+        events_list = []
+        for event in events:
+            attendee_list = [attendee['email'] for attendee in event.get("attendees") or [] if 'email' in attendee]
+            # Deduplicate once, keeping the original attendee order
+            unique_attendees = list(dict.fromkeys(attendee_list)) or ["SELF"]
+            
+            start_time = event.get("start", {}).get("dateTime")
+            end_time = event.get("end", {}).get("dateTime")
+            
+            if start_time and end_time:
+                events_list.append(self._add_parsed_times({
+                    "StartTime": start_time,
+                    "EndTime": end_time,
+                    "NumAttendees": len(unique_attendees),
+                    "Attendees": unique_attendees,
+                    "Summary": event.get("summary", "No Title")
+                }))
+        return events_list
+    
+    def _off_hours_events(self, start, end):
+        """Default off-hours events used when a user's calendar cannot be accessed"""
+        start_dt = self.parse_datetime(start)
+        end_dt = self.parse_datetime(end)
+        return [dict(event) for event in _off_hours_for_range(start_dt.date(), end_dt.date())]
+    
     def retrive_calendar_events(self, user, start, end):
         """Retrieve calendar events for a user"""
-        events_list = []
-        token_path = f"{self.keys_directory}/{user.split('@')[0]}.token"
-        
         try:
-            user_creds = Credentials.from_authorized_user_file(token_path)
-            calendar_service = build("calendar", "v3", credentials=user_creds)
-            events_result = calendar_service.events().list(
-                calendarId='primary', 
-                timeMin=start,
-                timeMax=end,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            events = events_result.get('items', [])
-            
-            for event in events:
-                attendee_list = []
-                try:
-                    for attendee in event.get("attendees", []):
-                        attendee_list.append(attendee['email'])
-                except:
-                    attendee_list.append("SELF")
-                
-                if not attendee_list:
-                    attendee_list.append("SELF")
-                
-                start_time = event.get("start", {}).get("dateTime")
-                end_time = event.get("end", {}).get("dateTime")
-                
-                if start_time and end_time:
-                    events_list.append({
-                        "StartTime": start_time,
-                        "EndTime": end_time,
-                        "NumAttendees": len(set(attendee_list)),
-                        "Attendees": list(set(attendee_list)),
-                        "Summary": event.get("summary", "No Title")
-                    })
+            calendar_service = self._build_calendar_service(user)
+            events_result = self._list_events_request(calendar_service, start, end).execute()
+            return self._format_events(events_result.get('items', []))
         except Exception as e:
-            print(f"Error retrieving calendar for {user}: {e}")
+            logger.warning("Error retrieving calendar for %s: %s", user, e)
             # Return default off-hours if calendar access fails
-            ist = timezone(timedelta(hours=IST_OFFSET_HOURS, minutes=IST_OFFSET_MINUTES))
-            start_dt = self.parse_datetime(start)
-            end_dt = self.parse_datetime(end)
-            
-            current_date = start_dt.date()
-            while current_date <= end_dt.date():
-                off_start = datetime.combine(current_date, datetime.min.time().replace(hour=WORKING_HOURS_END)).replace(tzinfo=ist)
-                off_end = datetime.combine(current_date + timedelta(days=1), datetime.min.time().replace(hour=WORKING_HOURS_START)).replace(tzinfo=ist)
-                
-                events_list.append({
-                    "StartTime": off_start.isoformat(),
-                    "EndTime": off_end.isoformat(),
-                    "NumAttendees": 1,
-                    "Attendees": ["SELF"],
-                    "Summary": "Off Hours"
-                })
-                current_date += timedelta(days=1)
+            return self._off_hours_events(start, end)
+    
+    def retrieve_all_calendar_events(self, users, start, end):
+        """
+        Retrieve calendar events for several users with batched HTTP requests
         
-        return events_list
+        Every user's events.list call is queued into a Google API batch request, so
+        all calendars are fetched in one HTTP round trip instead of one per user.
+        Each queued request keeps its own user's credentials.
+        
+        Args:
+            users: List of attendee emails
+            start: ISO datetime string for the start of the lookup window
+            end: ISO datetime string for the end of the lookup window
+        
+        Returns:
+            dict: Mapping of user email to their list of events
+        """
+        all_users_events = {}
+        
+        def handle_response(request_id, response, exception):
+            if exception is not None:
+                logger.warning("Error retrieving calendar for %s: %s", request_id, exception)
+                all_users_events[request_id] = self._off_hours_events(start, end)
+            else:
+                all_users_events[request_id] = self._format_events(response.get('items', []))
+        
+        # Prepare one request per user; users without valid credentials fall back immediately
+        requests = []
+        for user in dict.fromkeys(users):
+            logger.info("📅 Retrieving calendar for %s", user)
+            try:
+                calendar_service = self._build_calendar_service(user)
+                requests.append((user, calendar_service, self._list_events_request(calendar_service, start, end)))
+            except Exception as e:
+                logger.warning("Error retrieving calendar for %s: %s", user, e)
+                all_users_events[user] = self._off_hours_events(start, end)
+        
+        def execute_batch(chunk):
+            batch = chunk[0][1].new_batch_http_request(callback=handle_response)
+            for user, _, events_request in chunk:
+                batch.add(events_request, request_id=user)
+            try:
+                batch.execute()
+            except Exception as e:
+                logger.warning("Error executing calendar batch request: %s", e)
+                for user, _, _ in chunk:
+                    all_users_events.setdefault(user, self._off_hours_events(start, end))
+        
+        # The Calendar API accepts at most CALENDAR_BATCH_LIMIT calls per batch; when
+        # more batches are needed they are sent concurrently (each over its own service)
+        chunks = [requests[i:i + CALENDAR_BATCH_LIMIT] for i in range(0, len(requests), CALENDAR_BATCH_LIMIT)]
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                list(executor.map(execute_batch, chunks))
+        elif chunks:
+            execute_batch(chunks[0])
+        
+        # Keep the attendee order of the request
+        return {user: all_users_events[user] for user in dict.fromkeys(users)}
+    
+    def _complete_json(self, system_prompt, user_prompt, temperature, max_tokens, json_schema=None, cache_key=None):
+        """
+        Send a system + user prompt to the LLM and parse its JSON answer
+        
+        Deterministic (temperature 0) answers are cached, so a repeated request
+        skips the vLLM round trip entirely. Answers that fail to parse raise
+        json.JSONDecodeError and are never cached, so they are retried next time.
+        
+        Args:
+            system_prompt: Constant instructions for the model
+            user_prompt: Per-request content
+            temperature: Sampling temperature
+            max_tokens: Upper bound on the number of generated tokens
+            json_schema: Optional JSON schema the answer must follow (vLLM guided decoding)
+            cache_key: Optional cache key to use instead of the hash of the model and
+                prompts, for callers whose answer depends on less than the whole prompt
+        
+        Returns:
+            dict: Parsed JSON answer (a fresh copy on cache hits)
+        """
+        use_cache = temperature == 0
+        if use_cache:
+            key = cache_key or hashlib.sha256((self.model_path + "\0" + system_prompt + "\0" + user_prompt).encode()).digest()
+            with self._cache_lock:
+                cached = self._llm_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+        
+        # Constrain decoding to the schema, or at least to a JSON object (vLLM guided
+        # decoding), which also keeps the model from wrapping it in markdown fences.
+        # vLLM accepts only one kind of guided decoding per request.
+        if json_schema is not None:
+            guided = {"extra_body": {"guided_json": json_schema}}
+        else:
+            guided = {"response_format": {"type": "json_object"}}
+        
+        stream = self.client.chat.completions.create(
+            model=self.model_path,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **guided,
+            messages=[{
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user",
+                "content": user_prompt
+            }]
+        )
+        
+        result = json_loads(self._read_json_stream(stream))
+        if use_cache:
+            with self._cache_lock:
+                self._llm_cache[key] = dict(result)
+        return result
+    
+    def _read_json_stream(self, stream):
+        """
+        Read a streamed completion only up to the end of its first JSON object
+        
+        Tracks the brace depth (ignoring braces inside JSON strings) and closes the
+        stream as soon as the top-level object is complete, so trailing prose from
+        the model is never generated. Returns the whole streamed text if no
+        complete object is found.
+        """
+        chunks = []
+        object_start = None
+        depth = 0
+        in_string = False
+        escaped = False
+        offset = 0
+        
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content or ""
+            chunks.append(text)
+            for i, char in enumerate(text):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == '\\':
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = object_start is not None
+                elif char == '{':
+                    if object_start is None:
+                        object_start = offset + i
+                    depth += 1
+                elif char == '}' and depth > 0:
+                    depth -= 1
+                    if depth == 0:
+                        stream.close()
+                        return "".join(chunks)[object_start:offset + i + 1]
+            offset += len(text)
+        
+        return "".join(chunks)
     
     def parse_meeting_request(self, email_content, attendees_list):
         """Use DeepSeek to parse meeting requirements from email content"""
@@ -107,45 +514,29 @@ class AISchedulingAgent:
         # Create attendees string
         attendees_str = ", ".join([att["email"] for att in attendees_list])
         
-        prompt = f"""
-        You are an EVENT SCHEDULING EXPERT ASSISTANT. Parse the following meeting request and extract key information.
-        
-        Email Content: "{email_content}"
-        Attendees: {attendees_str}
-        
-        Extract and return ONLY a JSON object with these fields:
-        {{
-            "duration_minutes": <meeting duration in minutes, default {DEFAULT_MEETING_DURATION} if not specified>,
-            "time_preference": "<day preference like 'Thursday', 'next week', etc.>",
-            "meeting_type": "<type of meeting from subject/content>",
-            "urgency": "<high/medium/low based on content tone>"
-        }}
-        
-        Rules:
-        - If duration not specified, use {DEFAULT_MEETING_DURATION} minutes
-        - Extract day preferences (Monday, Tuesday, etc.)
-        - Be concise and accurate
-        - Return ONLY valid JSON, no other text
-        """
+        # Only the variable fields go in the user message; the instructions live in the
+        # constant system prompt so vLLM can reuse its cached prefix across requests
+        prompt = f"""Email Content: "{email_content}"
+Attendees: {attendees_str}"""
+        
+        # The extracted fields depend on the email text only (not on its casing or
+        # surrounding whitespace), so the same email sent to different attendees is
+        # served from the cache as well
+        content_key = hashlib.sha256(
+            (self.model_path + "\0parse\0" + email_content.strip().lower()).encode()
+        ).digest()
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_path,
+            return self._complete_json(
+                PARSE_SYSTEM_PROMPT,
+                prompt,
                 temperature=0.0,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
+                max_tokens=PARSE_MAX_TOKENS,
+                json_schema=PARSE_JSON_SCHEMA,
+                cache_key=content_key
             )
-            
-            content = response.choices[0].message.content.strip()
-            # Clean up the response to ensure it's valid JSON
-            if content.startswith('```json'):
-                content = content.replace('```json', '').replace('```', '').strip()
-            
-            return json.loads(content)
         except Exception as e:
-            print(f"Error parsing meeting request: {e}")
+            logger.warning("Error parsing meeting request: %s", e)
             # Return default values
             return {
                 "duration_minutes": DEFAULT_MEETING_DURATION,
@@ -154,77 +545,53 @@ class AISchedulingAgent:
                 "urgency": "medium"
             }
     
+    def _first_common_free_slot(self, all_users_events, date, duration_minutes, busy_periods=None, common_hours=None):
+        """Earliest slot on a date when all attendees are free, or None; stops scanning once found"""
+        return next(iter_common_free_slots(all_users_events, date, duration_minutes, busy_periods, common_hours=common_hours), None)
+    
     def find_optimal_meeting_time(self, all_users_events, duration_minutes, time_preference):
         """Find the best meeting time using your scheduler logic"""
         
         # Get date range from events
-        all_dates = set()
-        for events in all_users_events.values():
-            for event in events:
-                start_date = self.parse_datetime(event['StartTime']).date()
-                all_dates.add(start_date)
-        
-        date_range = sorted(list(all_dates))
-        
-        # Filter dates based on time preference with better logic
-        preferred_dates = []
-        
-        if "thursday" in time_preference.lower():
-            # Find next Thursday or upcoming Thursdays
-            for d in date_range:
-                if d.strftime('%A').lower() == 'thursday':
-                    preferred_dates.append(d)
-        elif "monday" in time_preference.lower():
-            preferred_dates = [d for d in date_range if d.strftime('%A').lower() == 'monday']
-        elif "tuesday" in time_preference.lower():
-            preferred_dates = [d for d in date_range if d.strftime('%A').lower() == 'tuesday']
-        elif "wednesday" in time_preference.lower():
-            preferred_dates = [d for d in date_range if d.strftime('%A').lower() == 'wednesday']
-        elif "friday" in time_preference.lower():
-            preferred_dates = [d for d in date_range if d.strftime('%A').lower() == 'friday']
-        else:
-            # If no specific day mentioned, prefer weekdays
-            preferred_dates = [d for d in date_range if d.weekday() < 5]  # Monday=0, Sunday=6
-        
-        print(f"🗓️ Available dates: {[str(d) + ' (' + d.strftime('%A') + ')' for d in date_range[:5]]}")
-        print(f"🎯 Preferred dates for '{time_preference}': {[str(d) + ' (' + d.strftime('%A') + ')' for d in preferred_dates[:3]]}")
-        
-        # Find best available slot on preferred days
-        for date in preferred_dates:
-            free_slots = find_common_free_slots(all_users_events, date, duration_minutes)
-            if free_slots:
-                # Return the first available slot
-                best_slot = free_slots[0]
-                print(f"✅ Found slot on {date} ({date.strftime('%A')}): {best_slot['start'].strftime('%H:%M')}")
-                return {
-                    'date': date,
-                    'start_time': best_slot['start'],
-                    'end_time': best_slot['start'] + timedelta(minutes=duration_minutes)
-                }
-        
-        # If no slots found on preferred days, try any weekdays
-        print("⚠️ No slots on preferred days, trying any weekday...")
-        weekdays = [d for d in sorted(list(all_dates)) if d.weekday() < 5]  # Monday=0, Sunday=6
-        for date in weekdays:
-            if date not in preferred_dates:  # Skip already checked dates
-                free_slots = find_common_free_slots(all_users_events, date, duration_minutes)
-                if free_slots:
-                    best_slot = free_slots[0]
-                    print(f"✅ Found alternative slot on {date} ({date.strftime('%A')}): {best_slot['start'].strftime('%H:%M')}")
-                    return {
-                        'date': date,
-                        'start_time': best_slot['start'],
-                        'end_time': best_slot['start'] + timedelta(minutes=duration_minutes)
-                    }
-        
-        # Only try weekends if no weekday slots available
-        print("⚠️ No weekday slots available, trying weekends...")
-        weekends = [d for d in sorted(list(all_dates)) if d.weekday() >= 5]  # Saturday=5, Sunday=6
-        for date in weekends:
-            free_slots = find_common_free_slots(all_users_events, date, duration_minutes)
-            if free_slots:
-                best_slot = free_slots[0]
-                print(f"✅ Found weekend slot on {date} ({date.strftime('%A')}): {best_slot['start'].strftime('%H:%M')}")
+        all_dates = {event['_start_date'] for events in all_users_events.values() for event in events}
+        
+        date_range = sorted(all_dates)
+        
+        # Filter dates based on the days named in the time preference,
+        # if no specific day mentioned, prefer weekdays
+        preference = time_preference.lower()
+        preferred_mask = sum(bit for name, bit in WEEKDAY_BITS.items() if name in preference) or WORKING_WEEKDAYS_MASK
+        preferred_dates = [d for d in date_range if (preferred_mask >> d.weekday()) & 1]
+        
+        # Parse every user's busy intervals and working hours once instead of once per candidate date
+        busy_periods = build_busy_periods(all_users_events)
+        common_hours = get_common_working_hours(get_all_working_hours(all_users_events))
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🗓️ Available dates: %s", [str(d) + ' (' + d.strftime('%A') + ')' for d in date_range[:5]])
+            logger.debug("🎯 Preferred dates for '%s': %s", time_preference, [str(d) + ' (' + d.strftime('%A') + ')' for d in preferred_dates[:3]])
+        
+        # Visit preferred days first, then any other weekday, and only then weekends,
+        # each group in date order, returning the first available slot
+        def date_priority(d):
+            if (preferred_mask >> d.weekday()) & 1:
+                return 0
+            if (WORKING_WEEKDAYS_MASK >> d.weekday()) & 1:
+                return 1
+            return 2
+        
+        current_priority = 0
+        for priority, date in sorted((date_priority(d), d) for d in date_range):
+            if priority > current_priority:
+                if current_priority < 1 <= priority:
+                    logger.info("⚠️ No slots on preferred days, trying any weekday...")
+                if priority == 2:
+                    logger.info("⚠️ No weekday slots available, trying weekends...")
+                current_priority = priority
+            
+            best_slot = self._first_common_free_slot(all_users_events, date, duration_minutes, busy_periods, common_hours)
+            if best_slot:
+                logger.info("✅ Found %s on %s (%s): %s", SLOT_KINDS[priority], date, date.strftime('%A'), best_slot['start'].strftime('%H:%M'))
                 return {
                     'date': date,
                     'start_time': best_slot['start'],
@@ -233,7 +600,34 @@ class AISchedulingAgent:
         
         return None
     
-    def user_helper(self, email_content, attendees_list, optimal_time, all_users_events):
+    def _helper_context(self, optimal_time, all_users_events):
+        """
+        Summarize the attendees' calendars around a meeting for user_helper
+        
+        In a single pass, counts existing meetings for each attendee on that day
+        and collects the conflicts that were avoided (simplified analysis).
+        
+        Returns:
+            tuple: (meeting_counts dict of email to count, conflicts_avoided list)
+        """
+        meeting_day = optimal_time['start_time'].date()
+        meeting_ts = optimal_time['start_time'].timestamp()
+        meeting_counts = {}
+        conflicts_avoided = []
+        for email, events in all_users_events.items():
+            day_meetings = 0
+            for event in events:
+                if OFF_HOURS in event['Summary']:
+                    continue
+                if event['_start_date'] == meeting_day:
+                    day_meetings += 1
+                # Check if there were potential conflicts around the scheduled time
+                if abs(event['_start_ts'] - meeting_ts) < 3600:
+                    conflicts_avoided.append(f"{email}: {event['Summary']}")
+            meeting_counts[email] = day_meetings
+        return meeting_counts, conflicts_avoided
+    
+    def user_helper(self, email_content, attendees_list, optimal_time, all_users_events, context=None):
         """
         This function helps the user understand their meeting scheduling decision.
         
@@ -247,6 +641,7 @@ class AISchedulingAgent:
                 - this is the time which is suggested by the AI
             all_users_events: All attendees' calendar events
                 - this is the list of events of all attendees
+            context: Result of _helper_context() when the caller already has it
 
         Returns:
             dict: Reasoning and insights about the scheduled meeting
@@ -257,89 +652,33 @@ class AISchedulingAgent:
         meeting_time = optimal_time['start_time'].strftime('%I:%M %p')
         meeting_end = optimal_time['end_time'].strftime('%I:%M %p')
         
-        # Count existing meetings for each attendee on that day
-        meeting_counts = {}
-        for email, events in all_users_events.items():
-            day_meetings = 0
-            for event in events:
-                event_date = self.parse_datetime(event['StartTime']).date()
-                if event_date == optimal_time['start_time'].date() and 'Off Hours' not in event['Summary']:
-                    day_meetings += 1
-            meeting_counts[email] = day_meetings
+        # Existing meetings per attendee on that day and conflicts that were avoided
+        meeting_counts, conflicts_avoided = context or self._helper_context(optimal_time, all_users_events)
         
-        # Analyze conflicts that were avoided (simplified analysis)
-        conflicts_avoided = []
-        for email, events in all_users_events.items():
-            for event in events:
-                event_start = self.parse_datetime(event['StartTime'])
-                event_end = self.parse_datetime(event['EndTime'])
-                # Check if there were potential conflicts around the scheduled time
-                if (abs((event_start - optimal_time['start_time']).total_seconds()) < 3600 and 
-                    'Off Hours' not in event['Summary']):
-                    conflicts_avoided.append(f"{email}: {event['Summary']}")
-        
-        prompt = f"""
-        You are an EVENT SCHEDULING EXPERT ASSISTANT. Analyze this meeting scheduling decision and provide helpful insights.
-        
-        MEETING DETAILS:
-        - Email Content: "{email_content}"
-        - Attendees: {', '.join(attendees_list)}
-        - Scheduled Time: {meeting_date} at {meeting_time} - {meeting_end}
-        
-        ATTENDEE WORKLOAD:
-        {chr(10).join([f"- {email}: {count} other meetings on this day" for email, count in meeting_counts.items()])}
-        
-        CONFLICTS AVOIDED:
-        {chr(10).join([f"- {conflict}" for conflict in conflicts_avoided]) if conflicts_avoided else "- No conflicts detected"}
-        
-        Please provide:
-        1. Why this time slot is optimal for all attendees
-        2. Key benefits of this scheduling decision
-        3. Any considerations the organizer should keep in mind
-        4. Productivity tips for making the meeting effective
-        
-        Format your response as a helpful, concise JSON with these keys:
-        - "reasoning": Brief explanation of why this time works well
-        - "benefits": List of 2-3 key benefits
-        - "considerations": List of 1-2 things to keep in mind
-        - "confidence_score": Your confidence in this scheduling (high/medium/low)
-        """
+        prompt = f"""MEETING DETAILS:
+- Email Content: "{email_content}"
+- Attendees: {', '.join(attendees_list)}
+- Scheduled Time: {meeting_date} at {meeting_time} - {meeting_end}
+
+ATTENDEE WORKLOAD:
+{chr(10).join([f"- {email}: {count} other meetings on this day" for email, count in meeting_counts.items()])}
+
+CONFLICTS AVOIDED:
+{chr(10).join([f"- {conflict}" for conflict in conflicts_avoided]) if conflicts_avoided else "- No conflicts detected"}"""
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_path,
-                temperature=0.1,  # Slightly creative but still focused
-                messages=[{
-                    "role": "system",
-                    "content": "You are a helpful EXPERT SCHEDULING ASSISTANT that provides clear, actionable insights about meeting scheduling decisions."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-            
-            content = response.choices[0].message.content.strip()
-            
-            # Clean up the response to ensure it's valid JSON
-            if content.startswith('```json'):
-                content = content.replace('```json', '').replace('```', '').strip()
-            
             # Parse the JSON response
-            import json
             try:
-                reasoning_data = json.loads(content)
+                # Slightly creative but still focused
+                reasoning_data = self._complete_json(HELPER_SYSTEM_PROMPT, prompt, temperature=0.1, max_tokens=HELPER_MAX_TOKENS)
             except json.JSONDecodeError:
-                # Fallback if AI doesn't return valid JSON
-                reasoning_data = {
-                    "reasoning": f"Scheduled for {meeting_date} at {meeting_time} to accommodate all attendees' availability.",
-                    "benefits": [
-                        "All attendees are available at this time",
-                        "No conflicts with existing meetings",
-                        "Optimal time slot for productivity"
-                    ],
-                    "confidence_score": "high"
-                }
+                # Fallback if AI doesn't return valid JSON (marked so it is not reused
+                # for other meetings)
+                reasoning_data = dict(
+                    HELPER_FALLBACK_INSIGHTS,
+                    reasoning=_slot_reasoning(optimal_time['start_time']),
+                    _fallback=True
+                )
             
             # Add additional metadata
             reasoning_data["scheduled_datetime"] = optimal_time['start_time'].isoformat()
@@ -358,8 +697,16 @@ class AISchedulingAgent:
                 "attendee_count": len(attendees_list)
             }
 
-    def generate_output_format(self, request_data, optimal_time, all_users_events, duration_minutes):
-        """Generate the exact output format required"""
+    def generate_output_format(self, request_data, optimal_time, all_users_events, duration_minutes, all_attendees, meeting_info=None):
+        """
+        Generate the exact output format required
+        
+        all_attendees lists the sender followed by every attendee, each only once.
+        When meeting_info is given, the MetaData insights are reused from an earlier
+        request with the same meeting type, urgency, email, attendees, weekday, time
+        and calendar load around the meeting instead of asking the LLM again. Only
+        model-written insights that don't name their calendar date are reused.
+        """
         
         if not optimal_time:
             raise Exception("No available time slots found")
@@ -379,54 +726,92 @@ class AISchedulingAgent:
             "MetaData": {}
         }
         
-        # Get all attendees including the sender
-        all_attendees = [request_data["From"]]
-        for att in request_data["Attendees"]:
-            all_attendees.append(att["email"])
-        
-        # Generate AI-powered insights for the MetaData field
-        try:
-            attendee_emails = [att["email"] for att in request_data["Attendees"]]
-            metadata_insights = self.user_helper(
+        attendee_emails = [att["email"] for att in request_data["Attendees"]]
+        
+        # Look for insights generated for a similar meeting
+        plan_key = None
+        cached_insights = None
+        helper_context = self._helper_context(optimal_time, all_users_events)
+        if meeting_info is not None:
+            meeting_counts, conflicts_avoided = helper_context
+            plan_key = (
+                str(meeting_info.get("meeting_type")),
+                str(meeting_info.get("urgency")),
+                hashlib.sha256(request_data["EmailContent"].encode()).digest(),
+                tuple(sorted(all_attendees)),
+                optimal_time['start_time'].weekday(),
+                optimal_time['start_time'].timetz(),
+                optimal_time['end_time'].timetz(),
+                tuple(sorted(meeting_counts.items())),
+                tuple(conflicts_avoided)
+            )
+            with self._cache_lock:
+                cached_insights = self._plan_cache.get(plan_key)
+        
+        # Otherwise generate AI-powered insights for the MetaData field in the
+        # background while the attendee calendars are assembled
+        if cached_insights is None:
+            metadata_future = self._executor.submit(
+                self.user_helper,
                 request_data["EmailContent"],
                 attendee_emails,
                 optimal_time,
-                all_users_events
+                all_users_events,
+                helper_context
             )
-            response["MetaData"] = metadata_insights
-            print('EXTRACTED FROM DEEPSEEK',metadata_insights)
-        except Exception as e:
-            print(f"⚠️ Warning: Could not generate metadata insights: {e}")
-            response["MetaData"] = {
-                "reasoning": "Meeting scheduled based on attendee availability",
-                "confidence_score": "medium",
-                "error": str(e)
-            }
         
         # Create the new meeting event
         new_meeting = {
             "StartTime": optimal_time['start_time'].isoformat(),
             "EndTime": optimal_time['end_time'].isoformat(),
             "NumAttendees": len(all_attendees),
-            "Attendees": all_attendees,
-            "Summary": request_data["Subject"]
+            "Attendees": list(all_attendees),
+            "Summary": request_data["Subject"],
+            "_start_dt": optimal_time['start_time']
         }
         
         # Generate attendee data with their existing events + new meeting
         for attendee_email in all_attendees:
-            attendee_events = all_users_events.get(attendee_email, []).copy()
-            
-            # Add the new meeting to their calendar
-            attendee_events.append(new_meeting)
+            attendee_events = list(all_users_events.get(attendee_email, []))
             
-            # Sort events by start time
-            attendee_events.sort(key=lambda x: self.parse_datetime(x['StartTime']))
+            # Add the new meeting to their calendar, the events are already in
+            # start time order (orderBy='startTime') so a single insert keeps them sorted
+            insort(attendee_events, new_meeting, key=itemgetter('_start_dt'))
             
             response["Attendees"].append({
                 "email": attendee_email,
-                "events": attendee_events
+                # Drop the internal pre-parsed fields from the output
+                "events": [{k: v for k, v in event.items() if not k.startswith('_')} for event in attendee_events]
             })
         
+        try:
+            if cached_insights is not None:
+                # Per-request fields are always refreshed
+                metadata_insights = dict(cached_insights)
+                metadata_insights["scheduled_datetime"] = optimal_time['start_time'].isoformat()
+                metadata_insights["attendee_count"] = len(attendee_emails)
+            else:
+                metadata_insights = metadata_future.result()
+                fallback = metadata_insights.pop("_fallback", False)
+                # Fallbacks and failures are retried next time, and insights naming
+                # their date would be wrong for another week's meeting
+                if (plan_key is not None and not fallback and "error" not in metadata_insights
+                        and not _mentions_date(metadata_insights, optimal_time['start_time'])):
+                    with self._cache_lock:
+                        self._plan_cache[plan_key] = {
+                            k: v for k, v in metadata_insights.items()
+                            if k not in PER_REQUEST_INSIGHTS
+                        }
+            response["MetaData"] = metadata_insights
+            logger.debug("EXTRACTED FROM DEEPSEEK %s", metadata_insights)
+        except Exception as e:
+            logger.warning("⚠️ Could not generate metadata insights: %s", e)
+            response["MetaData"] = {
+                "reasoning": "Meeting scheduled based on attendee availability",
+                "confidence_score": "medium",
+                "error": str(e)
+            }
+        
         return response
     
     def your_meeting_assistant(self, request_json):
@@ -436,39 +821,49 @@ class AISchedulingAgent:
         """
         try:
             # Parse the request
-            if isinstance(request_json, str):
-                request_data = json.loads(request_json)
+            if isinstance(request_json, (str, bytes)):
+                request_data = json_loads(request_json)
             else:
                 request_data = request_json
             
-            print(f"🚀 Processing meeting request: {request_data['Request_id']}")
+            logger.info("🚀 Processing meeting request: %s", request_data['Request_id'])
             
-            # Extract attendees
-            all_attendees = [request_data["From"]]
-            for att in request_data["Attendees"]:
-                all_attendees.append(att["email"])
+            # Extract attendees including the sender (listed once even if the sender
+            # is also among the attendees), shared by the lookup and the output
+            all_attendees = tuple(dict.fromkeys(
+                [request_data["From"]] + [att["email"] for att in request_data["Attendees"]]
+            ))
             
-            # Parse meeting requirements using AI
-            meeting_info = self.parse_meeting_request(
+            # The calendar lookup window does not depend on the parsed request, so start
+            # parsing the meeting requirements using AI right away and retrieve the
+            # calendars speculatively while the LLM call is in flight
+            meeting_info_future = self._executor.submit(
+                self.parse_meeting_request,
                 request_data["EmailContent"], 
                 request_data["Attendees"]
             )
             
-            print(f"📝 Parsed meeting info: {meeting_info}")
-            
             # Set date range for calendar lookup (next CALENDAR_LOOKUP_DAYS days)
-            start_date = datetime.now(timezone(timedelta(hours=IST_OFFSET_HOURS, minutes=IST_OFFSET_MINUTES)))
+            start_date = datetime.now(IST)
             end_date = start_date + timedelta(days=CALENDAR_LOOKUP_DAYS)
             
             start_str = start_date.isoformat()
             end_str = end_date.isoformat()
             
-            # Retrieve calendar events for all attendees
-            all_users_events = {}
-            for attendee in all_attendees:
-                print(f"📅 Retrieving calendar for {attendee}")
-                events = self.retrive_calendar_events(attendee, start_str, end_str)
-                all_users_events[attendee] = events
+            # Retrieve calendar events for all attendees in a single batch request
+            all_users_events = self.retrieve_all_calendar_events(all_attendees, start_str, end_str)
+            
+            # The rest of the analysis only depends on the request and these calendars
+            response_key = (content_hash(request_data), content_hash(all_users_events))
+            with self._cache_lock:
+                cached_result = self._response_cache.get(response_key)
+            if cached_result is not None:
+                logger.info("♻️ Serving cached response for request: %s", request_data['Request_id'])
+                return cached_result
+            
+            meeting_info = meeting_info_future.result()
+            
+            logger.debug("📝 Parsed meeting info: %s", meeting_info)
             
             # Find optimal meeting time
             optimal_time = self.find_optimal_meeting_time(
@@ -478,23 +873,30 @@ class AISchedulingAgent:
             )
             
             if optimal_time:
-                print(f"✅ Found optimal time: {optimal_time['start_time']} - {optimal_time['end_time']}")
+                logger.info("✅ Found optimal time: %s - %s", optimal_time['start_time'], optimal_time['end_time'])
             else:
-                print("❌ No available time slots found")
+                logger.info("❌ No available time slots found")
             
             # Generate the final output
             result = self.generate_output_format(
                 request_data, 
                 optimal_time, 
                 all_users_events, 
-                meeting_info["duration_minutes"]
+                meeting_info["duration_minutes"],
+                all_attendees,
+                meeting_info
             )
             
-            print(f"🎯 Successfully scheduled meeting!")
+            # Failed requests are retried next time instead of being cached
+            if "error" not in result and not result.get("MetaData", {}).get("error"):
+                with self._cache_lock:
+                    self._response_cache[response_key] = result
+            
+            logger.info("🎯 Successfully scheduled meeting!")
             return result
             
         except Exception as e:
-            print(f"❌ Error processing meeting request: {e}")
+            logger.error("❌ Error processing meeting request: %s", e)
             return {
                 "error": str(e),
                 "Request_id": request_data.get("Request_id", "unknown")
@@ -502,6 +904,8 @@ class AISchedulingAgent:
 
 # Example usage and testing
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+    
     # Initialize the agent
     agent = AISchedulingAgent()
     
@@ -524,4 +928,4 @@ if __name__ == "__main__":
     
     # Print the result
     print("\n🏆 FINAL RESULT:")
-    print(json.dumps(result, indent=2))
+    print(json_dumps_indented(result))
@@ -14,6 +14,15 @@ CALENDAR_LOOKUP_DAYS = 30  # days to look ahead for scheduling
 WORKING_HOURS_START = 9  # 9 AM
 WORKING_HOURS_END = 17  # 5 PM (17:30 for 5:30 PM)
 
+# LLM Response Cache Configuration
+LLM_CACHE_SIZE = 500  # maximum number of cached LLM responses
+LLM_CACHE_TTL = 3600  # seconds a cached LLM response stays valid
+
+# HTTP Server Configuration
+SERVER_THREADS = 16  # worker threads serving /receive concurrently
+RESPONSE_CACHE_SIZE = 512  # maximum number of cached meeting responses
+RESPONSE_CACHE_TTL = 60  # seconds a repeated request on unchanged calendars is answered from the cache
+
 # Timezone Configuration
 IST_OFFSET_HOURS = 5
 IST_OFFSET_MINUTES = 30
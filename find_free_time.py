@@ -1,11 +1,28 @@
+import heapq
+import logging
+import functools
+from operator import itemgetter
 from datetime import datetime, timedelta, timezone
 
+logger = logging.getLogger(__name__)
+
+# Indian Standard Time, the timezone the working hours are expressed in
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# Summary of the calendar events that mark a user's time outside working hours
+OFF_HOURS = 'Off Hours'
+
+# Day names indexed by date.weekday(), without strftime's locale lookup
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+@functools.lru_cache(maxsize=8192)
 def parse_datetime(datetime_str):
     """
     Parse ISO datetime string to datetime object.
     
     Converts an ISO 8601 formatted datetime string (with timezone information)
-    into a Python datetime object for further processing.
+    into a Python datetime object for further processing. Results are memoized,
+    since the same timestamps repeat across users and calls.
     
     Args:
         datetime_str (str): ISO 8601 formatted datetime string with timezone
@@ -29,16 +46,20 @@ def format_datetime_for_calendar(dt):
     """Format datetime object back to calendar API format"""
     return dt.isoformat()
 
+def format_hhmm(dt):
+    """Format the time of a datetime as HH:MM (same as strftime('%H:%M'), minus the locale machinery)"""
+    return f"{dt.hour:02d}:{dt.minute:02d}"
+
 def get_user_working_hours(user_email, events_list):
     """Determine working hours for a user based on their Off Hours pattern"""
-    off_hours_events = [e for e in events_list if e['Summary'] == 'Off Hours']
+    # Only the first Off Hours event is needed to read the pattern
+    sample_event = next((e for e in events_list if e['Summary'] == OFF_HOURS), None)
     
-    if not off_hours_events:
+    if sample_event is None:
         # Default working hours if no Off Hours found
         return (9, 0), (17, 30)  # 9:00 AM to 5:30 PM
     
     # Analyze Off Hours pattern to determine working hours
-    sample_event = off_hours_events[0]
     off_start = parse_datetime(sample_event['StartTime'])
     off_end = parse_datetime(sample_event['EndTime'])
     
@@ -50,79 +71,173 @@ def get_user_working_hours(user_email, events_list):
     
     return (work_start_hour, work_start_min), (work_end_hour, work_end_min)
 
-def find_common_free_slots(all_users_events, target_date, duration_minutes=30):
-    """Find time slots when ALL attendees are free"""
+def get_all_working_hours(all_users_events):
+    """Determine the working hours of every user once, keyed by user email"""
+    return {user_email: get_user_working_hours(user_email, events)
+            for user_email, events in all_users_events.items()}
+
+def get_common_working_hours(user_working_hours):
+    """
+    Intersect the users' working hours into the window everyone is working.
     
-    # Get working hours for each user
-    user_working_hours = {}
-    for user_email, events in all_users_events.items():
-        user_working_hours[user_email] = get_user_working_hours(user_email, events)
+    Args:
+        user_working_hours (dict): Working hours per user from get_all_working_hours()
     
-    # Find the most restrictive working hours (intersection)
-    earliest_start = max([wh[0] for wh in user_working_hours.values()])
-    latest_end = min([wh[1] for wh in user_working_hours.values()])
+    Returns:
+        tuple: ((start_hour, start_min), (end_hour, end_min)) of the common window
+    """
+    distinct_hours = set(user_working_hours.values())
+    if len(distinct_hours) == 1:
+        # Everyone keeps the same hours, nothing to intersect
+        return next(iter(distinct_hours))
+    
+    # Find the most restrictive working hours (intersection) in a single pass
+    earliest_start, latest_end = (0, 0), (24, 0)
+    for work_start, work_end in distinct_hours:
+        if work_start > earliest_start:
+            earliest_start = work_start
+        if work_end < latest_end:
+            latest_end = work_end
+    return earliest_start, latest_end
+
+def normalize_events(all_users_events):
+    """
+    Attach parsed times to every event, in place, so they are parsed only once.
     
-    # Create timezone object
-    ist = timezone(timedelta(hours=5, minutes=30))
+    Adds '_start_dt' and '_end_dt' (datetimes), '_start_date' (date) and
+    '_is_off_hours' (bool) to each event dict that does not have them yet; the
+    analysis functions below read these fields instead of re-parsing
+    'StartTime'/'EndTime' and re-comparing 'Summary'.
     
-    # Define the common working window
-    common_start = datetime.combine(target_date, datetime.min.time().replace(
-        hour=earliest_start[0], minute=earliest_start[1])).replace(tzinfo=ist)
-    common_end = datetime.combine(target_date, datetime.min.time().replace(
-        hour=latest_end[0], minute=latest_end[1])).replace(tzinfo=ist)
+    Args:
+        all_users_events (dict): Dictionary mapping user emails to their event lists
+    
+    Returns:
+        dict: The same all_users_events mapping
+    """
+    for events in all_users_events.values():
+        for event in events:
+            if '_start_dt' not in event:
+                event['_start_dt'] = parse_datetime(event['StartTime'])
+                event['_end_dt'] = parse_datetime(event['EndTime'])
+                event['_start_date'] = event['_start_dt'].date()
+            if '_is_off_hours' not in event:
+                event['_is_off_hours'] = event['Summary'] == OFF_HOURS
+    return all_users_events
+
+def get_event_dates(all_users_events):
+    """Return the sorted list of distinct dates any user's events start on"""
+    normalize_events(all_users_events)
+    return sorted({event['_start_date'] for events in all_users_events.values() for event in events})
+
+def build_busy_periods(all_users_events):
+    """
+    Precompute the busy intervals of all users once, grouped by date.
     
-    # Collect all busy periods for the target date
-    all_busy_periods = []
-    target_date_str = target_date.strftime('%Y-%m-%d')
+    Parses each event a single time and buckets it under the date it starts on,
+    so repeated find_common_free_slots() calls over many dates only look at the
+    intervals of their own date instead of re-scanning (and re-parsing) every
+    calendar. "Off Hours" events are skipped since they only define working hours.
+    Overlapping (or touching) intervals, e.g. a meeting shared by several
+    attendees, are merged so each date holds disjoint intervals only.
     
-    for user_email, events in all_users_events.items():
+    Args:
+        all_users_events (dict): Dictionary mapping user emails to their event lists
+    
+    Returns:
+        dict: Mapping of date to a start-sorted list of disjoint (start, end)
+              datetime tuples covering the busy periods of all users on that date
+    """
+    normalize_events(all_users_events)
+    busy_periods = {}
+    for events in all_users_events.values():
         for event in events:
-            event_start = parse_datetime(event['StartTime'])
-            event_end = parse_datetime(event['EndTime'])
-            event_date = event_start.date().strftime('%Y-%m-%d')
-            
-            if event_date == target_date_str and event['Summary'] != 'Off Hours':
-                all_busy_periods.append({
-                    'start': event_start,
-                    'end': event_end,
-                    'user': user_email,
-                    'summary': event['Summary']
-                })
-    
-    # Sort busy periods by start time
-    all_busy_periods.sort(key=lambda x: x['start'])
-    
-    # Find free slots in the common working window
-    free_slots = []
+            if not event['_is_off_hours']:
+                busy_periods.setdefault(event['_start_date'], []).append((event['_start_dt'], event['_end_dt']))
+    for date, intervals in busy_periods.items():
+        intervals.sort()
+        merged = [intervals[0]]
+        for busy_start, busy_end in intervals[1:]:
+            last_start, last_end = merged[-1]
+            if busy_start <= last_end:
+                if busy_end > last_end:
+                    merged[-1] = (last_start, busy_end)
+            else:
+                merged.append((busy_start, busy_end))
+        busy_periods[date] = merged
+    return busy_periods
+
+def find_common_free_slots(all_users_events, target_date, duration_minutes=30, busy_periods=None, user_working_hours=None, common_hours=None):
+    """
+    Find time slots when ALL attendees are free
+    
+    busy_periods and user_working_hours (or directly the common_hours window) can
+    be passed in from build_busy_periods(), get_all_working_hours() and
+    get_common_working_hours() when the same calendars are searched for several dates.
+    """
+    return list(iter_common_free_slots(all_users_events, target_date, duration_minutes, busy_periods, user_working_hours, common_hours))
+
+def iter_common_free_slots(all_users_events, target_date, duration_minutes=30, busy_periods=None, user_working_hours=None, common_hours=None):
+    """
+    Yield time slots when ALL attendees are free, earliest first
+    
+    Generator version of find_common_free_slots(); callers that only need the
+    first slot can stop without scanning the rest of the day.
+    """
+    
+    # Find the most restrictive working hours (intersection)
+    if common_hours is None:
+        if user_working_hours is None:
+            user_working_hours = get_all_working_hours(all_users_events)
+        common_hours = get_common_working_hours(user_working_hours)
+    earliest_start, latest_end = common_hours
+    
+    # Define the common working window
+    common_start = datetime(target_date.year, target_date.month, target_date.day,
+                            earliest_start[0], earliest_start[1], tzinfo=IST)
+    common_end = datetime(target_date.year, target_date.month, target_date.day,
+                          latest_end[0], latest_end[1], tzinfo=IST)
+    
+    # The attendees' working hours don't overlap at all
+    if common_start >= common_end:
+        return
+    
+    if busy_periods is None:
+        busy_periods = build_busy_periods(all_users_events)
+    
+    # All busy periods for the target date, already merged and sorted by start time
+    all_busy_periods = busy_periods.get(target_date, [])
+    
+    # Find free slots in the common working window; gaps are compared as timedeltas
+    # and only converted to minutes for the slots that are long enough
+    min_gap = timedelta(minutes=duration_minutes)
     current_time = common_start
     
-    for busy_period in all_busy_periods:
+    for busy_start, busy_end in all_busy_periods:
         # If there's a gap before this busy period
-        if current_time < busy_period['start']:
-            gap_duration = (busy_period['start'] - current_time).total_seconds() / 60
-            if gap_duration >= duration_minutes:
-                free_slots.append({
+        if current_time < busy_start:
+            gap = busy_start - current_time
+            if gap >= min_gap:
+                yield {
                     'start': current_time,
-                    'end': busy_period['start'],
-                    'duration_minutes': int(gap_duration)
-                })
+                    'end': busy_start,
+                    'duration_minutes': int(gap.total_seconds() // 60)
+                }
         
         # Move current time to end of this busy period
-        current_time = max(current_time, busy_period['end'])
+        current_time = max(current_time, busy_end)
     
     # Check if there's time after the last busy period
     if current_time < common_end:
-        gap_duration = (common_end - current_time).total_seconds() / 60
-        if gap_duration >= duration_minutes:
-            free_slots.append({
+        gap = common_end - current_time
+        if gap >= min_gap:
+            yield {
                 'start': current_time,
                 'end': common_end,
-                'duration_minutes': int(gap_duration)
-            })
-    
-    return free_slots
+                'duration_minutes': int(gap.total_seconds() // 60)
+            }
 
-def suggest_optimal_meeting_time(all_users_events, duration_minutes=30, preferred_days=None):
+def suggest_optimal_meeting_time(all_users_events, duration_minutes=30, preferred_days=None, busy_periods=None, user_working_hours=None, all_dates=None):
     """
     Suggest the best meeting time across multiple days.
     
@@ -143,6 +258,12 @@ def suggest_optimal_meeting_time(all_users_events, duration_minutes=30, preferre
                                         Defaults to 30.
         preferred_days (list, optional): List of preferred day names (e.g., ['Monday', 'Tuesday']).
                                        If None, considers all days. Defaults to None.
+        busy_periods (dict, optional): Busy intervals from build_busy_periods(), built
+                                     here if None. Defaults to None.
+        user_working_hours (dict, optional): Working hours from get_all_working_hours(),
+                                           computed here if None. Defaults to None.
+        all_dates (list, optional): Sorted dates to search from get_event_dates(),
+                                  computed here if None. Defaults to None.
     
     Returns:
         list: List of meeting suggestion dictionaries, each containing:
@@ -168,7 +289,8 @@ def suggest_optimal_meeting_time(all_users_events, duration_minutes=30, preferre
     Algorithm:
         1. Extracts all unique dates from user events
         2. Filters by preferred days if specified
-        3. Finds free slots for each date using find_common_free_slots()
+        3. Finds free slots for each date using find_common_free_slots(), all
+           dates sharing a single build_busy_periods() pass over the events
         4. Creates meeting suggestions for each available slot
         5. Sorts suggestions chronologically
     
@@ -178,36 +300,51 @@ def suggest_optimal_meeting_time(all_users_events, duration_minutes=30, preferre
         - Duration filtering ensures only slots of adequate length are suggested
     """
     
-    # Get date range from all events
-    all_dates = set()
-    for events in all_users_events.values():
-        for event in events:
-            start_date = parse_datetime(event['StartTime']).date()
-            all_dates.add(start_date)
+    suggestions = list(iter_meeting_suggestions(
+        all_users_events, duration_minutes, preferred_days, busy_periods, user_working_hours, all_dates
+    ))
+    
+    # Sort by date and time
+    suggestions.sort(key=itemgetter('start_time'))
     
-    all_dates = sorted(list(all_dates))
+    return suggestions
+
+def iter_meeting_suggestions(all_users_events, duration_minutes=30, preferred_days=None, busy_periods=None, user_working_hours=None, all_dates=None):
+    """
+    Yield meeting suggestions date by date, in the format of suggest_optimal_meeting_time()
+    
+    Generator version of suggest_optimal_meeting_time() (same arguments) that
+    neither materializes nor sorts the suggestions, for callers that only need a
+    few of them.
+    """
+    
+    # Get date range from all events
+    if all_dates is None:
+        all_dates = get_event_dates(all_users_events)
     
     # If preferred days specified, filter to those
     if preferred_days:
-        all_dates = [d for d in all_dates if d.strftime('%A').lower() in [day.lower() for day in preferred_days]]
+        preferred_lower = {day.lower() for day in preferred_days}
+        all_dates = [d for d in all_dates if WEEKDAY_NAMES[d.weekday()].lower() in preferred_lower]
+    
+    if busy_periods is None:
+        busy_periods = build_busy_periods(all_users_events)
+    if user_working_hours is None:
+        user_working_hours = get_all_working_hours(all_users_events)
+    common_hours = get_common_working_hours(user_working_hours)
     
-    suggestions = []
+    duration = timedelta(minutes=duration_minutes)
     
     for date in all_dates:
-        free_slots = find_common_free_slots(all_users_events, date, duration_minutes)
-        for slot in free_slots:
-            suggestions.append({
+        day_of_week = WEEKDAY_NAMES[date.weekday()]
+        for slot in iter_common_free_slots(all_users_events, date, duration_minutes, busy_periods, common_hours=common_hours):
+            yield {
                 'date': date,
                 'start_time': slot['start'],
-                'end_time': slot['start'] + timedelta(minutes=duration_minutes),
+                'end_time': slot['start'] + duration,
                 'available_duration': slot['duration_minutes'],
-                'day_of_week': date.strftime('%A')
-            })
-    
-    # Sort by date and time
-    suggestions.sort(key=lambda x: x['start_time'])
-    
-    return suggestions
+                'day_of_week': day_of_week
+            }
 
 def analyze_multi_user_availability(all_users_events):
     """
@@ -235,7 +372,8 @@ def analyze_multi_user_availability(all_users_events):
               - 'analysis_complete': Boolean indicating successful completion
     
     Output:
-        Prints detailed analysis to console including:
+        Logs the analysis (the per-slot breakdown at DEBUG level, the rest at
+        INFO level) including:
         - Each user's working hours
         - Date range being analyzed
         - Daily breakdown of free slots with times and durations
@@ -258,7 +396,7 @@ def analyze_multi_user_availability(all_users_events):
         - Automatically detects working hours from "Off Hours" events
         - Finds intersection of all users' working hours
         - Identifies common free time slots
-        - Provides formatted console output for easy reading
+        - Provides formatted log output for easy reading
         - Returns structured data for programmatic use
     
     Note:
@@ -267,56 +405,65 @@ def analyze_multi_user_availability(all_users_events):
         - Excludes "Off Hours" events from busy time calculation
         - Provides both human-readable output and machine-readable results
     """
-    print("🎯 MULTI-USER AVAILABILITY ANALYSIS")
-    print("=" * 60)
+    logger.info("🎯 MULTI-USER AVAILABILITY ANALYSIS")
+    logger.info("=" * 60)
     
     # Analyze each user's working hours
-    print("\n👥 USER WORKING HOURS:")
-    for user_email, events in all_users_events.items():
-        working_hours = get_user_working_hours(user_email, events)
-        print(f"   {user_email}: {working_hours[0][0]:02d}:{working_hours[0][1]:02d} - {working_hours[1][0]:02d}:{working_hours[1][1]:02d}")
+    logger.info("\n👥 USER WORKING HOURS:")
+    user_working_hours = get_all_working_hours(all_users_events)
+    for user_email, working_hours in user_working_hours.items():
+        logger.info("   %s: %02d:%02d - %02d:%02d", user_email, working_hours[0][0], working_hours[0][1], working_hours[1][0], working_hours[1][1])
     
-    # Get date range
-    all_dates = set()
-    for events in all_users_events.values():
-        for event in events:
-            start_date = parse_datetime(event['StartTime']).date()
-            all_dates.add(start_date)
-    all_dates = sorted(list(all_dates))
+    # Get date range, shared with the suggestions below
+    all_dates = get_event_dates(all_users_events)
     
-    print(f"\n📅 ANALYZING DATES: {all_dates[0]} to {all_dates[-1]}")
+    logger.info("\n📅 ANALYZING DATES: %s to %s", all_dates[0], all_dates[-1])
+    
+    # Bucket everyone's busy intervals by date and intersect the working hours
+    # once for all the dates below
+    busy_periods = build_busy_periods(all_users_events)
+    common_hours = get_common_working_hours(user_working_hours)
     
     # Analyze each date
     total_slots = 0
     for date in all_dates:
-        print(f"\n🗓️  {date} ({date.strftime('%A')}):")
-        free_slots = find_common_free_slots(all_users_events, date, 30)
+        logger.info("\n🗓️  %s (%s):", date, WEEKDAY_NAMES[date.weekday()])
+        free_slots = find_common_free_slots(all_users_events, date, 30, busy_periods, common_hours=common_hours)
         
         if free_slots:
-            print(f"   ✅ {len(free_slots)} common free slots:")
-            for i, slot in enumerate(free_slots, 1):
-                print(f"      {i}. {slot['start'].strftime('%H:%M')} - {slot['end'].strftime('%H:%M')} ({slot['duration_minutes']} mins)")
+            logger.info("   ✅ %d common free slots:", len(free_slots))
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, slot in enumerate(free_slots, 1):
+                    logger.debug("      %d. %s - %s (%d mins)", i, format_hhmm(slot['start']), format_hhmm(slot['end']), slot['duration_minutes'])
             total_slots += len(free_slots)
         else:
-            print("   ❌ No common free time")
+            logger.info("   ❌ No common free time")
     
-    print(f"\n📊 SUMMARY: {total_slots} total available slots across all dates")
+    logger.info("\n📊 SUMMARY: %d total available slots across all dates", total_slots)
     
-    # Get top 3 suggestions for 30-minute meetings
-    suggestions = suggest_optimal_meeting_time(all_users_events, 30)
+    # Get top 3 suggestions for 30-minute meetings, without sorting all of them
+    suggestions = heapq.nsmallest(3, iter_meeting_suggestions(
+        all_users_events, 30,
+        busy_periods=busy_periods,
+        user_working_hours=user_working_hours,
+        all_dates=all_dates
+    ), key=itemgetter('start_time'))
     if suggestions:
-        print(f"\n🏆 TOP 3 MEETING SUGGESTIONS (30 mins):")
-        for i, suggestion in enumerate(suggestions[:3], 1):
-            print(f"   {i}. {suggestion['date']} ({suggestion['day_of_week']}) at {suggestion['start_time'].strftime('%H:%M')}")
+        logger.info("\n🏆 TOP 3 MEETING SUGGESTIONS (30 mins):")
+        for i, suggestion in enumerate(suggestions, 1):
+            logger.info("   %d. %s (%s) at %s", i, suggestion['date'], suggestion['day_of_week'], format_hhmm(suggestion['start_time']))
     
     return {
         'total_available_slots': total_slots,
-        'suggestions': suggestions[:3],
+        'suggestions': suggestions,
         'analysis_complete': True
     }
 
 # Test with your data
 if __name__ == "__main__":
+    # Print the whole analysis, including the per-slot breakdown
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+    
     # Your sample data
     user_one_events = [
         {'StartTime': '2025-07-13T18:00:00+05:30', 'EndTime': '2025-07-14T09:00:00+05:30', 'NumAttendees': 1, 'Attendees': ['SELF'], 'Summary': 'Off Hours'},
@@ -1,12 +1,27 @@
 from flask import Flask, request, jsonify
 from threading import Thread
 import json
+import logging
 import time
 import signal
 import sys
 
+# orjson is an optional, faster drop-in for serializing the responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+# waitress is an optional production WSGI server for the app
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
 # Import your final AI scheduling agent
 from agent_vinod import AISchedulingAgent
+from config import SERVER_THREADS
+
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 received_data = []
@@ -15,6 +30,13 @@ received_data = []
 agent = AISchedulingAgent()
 
 
+def json_response(obj):
+    """Build a JSON response, serialized with orjson when it is installed"""
+    if orjson is not None:
+        return app.response_class(orjson.dumps(obj), mimetype='application/json')
+    return jsonify(obj)
+
+
 def your_meeting_assistant(data): 
     """
     Main function that processes meeting requests using your AI agent
@@ -25,7 +47,7 @@ def your_meeting_assistant(data):
         result = agent.your_meeting_assistant(data)
         return result
     except Exception as e:
-        print(f"❌ Error in your_meeting_assistant: {e}")
+        logger.error("❌ Error in your_meeting_assistant: %s", e)
         # Return error response in expected format
         return {
             "error": str(e),
@@ -39,20 +61,33 @@ def your_meeting_assistant(data):
 @app.route('/receive', methods=['POST'])
 def receive():
     data = request.get_json()
-    print(f"\n Received: {json.dumps(data, indent=2)}")
+    # Dumping the full payloads is slow, only do it when debug logging is on
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("\n Received: %s", json.dumps(data, indent=2))
     new_data = your_meeting_assistant(data)  # Your AI Meeting Assistant Function Call
     received_data.append(data)
-    print(f"\n\n\n Sending:\n {json.dumps(new_data, indent=2)}")
-    return jsonify(new_data)
+    if debug:
+        logger.debug("\n\n\n Sending:\n %s", json.dumps(new_data, indent=2))
+    return json_response(new_data)
 
 def run_flask():
-    app.run(host='0.0.0.0', port=5000)
+    # Serve requests concurrently, the development server is only a fallback. This is
+    # safe because the agent builds its (httplib2-based, not thread-safe) Calendar
+    # services per thread and only shares thread-safe clients and locked caches
+    if serve is not None:
+        serve(app, host='0.0.0.0', port=5000, threads=SERVER_THREADS)
+    else:
+        app.run(host='0.0.0.0', port=5000, threaded=True)
 
 def signal_handler(sig, frame):
     print('\n🛑 Shutting down server...')
     sys.exit(0)
 
 if __name__ == "__main__":
+    # Show the agent's progress messages; use logging.DEBUG for detailed output
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Set up signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     